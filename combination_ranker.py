@@ -1,6 +1,6 @@
-import copy
-from functools import reduce
+from functools import cached_property, lru_cache, reduce
 import heapq
+import math
 from dataclasses import dataclass
 import operator
 from typing import Any, Callable
@@ -11,15 +11,34 @@ class Parameter:
     name: str
 
 
-@dataclass
+@dataclass(frozen=True, eq=False)
 class ParameterValueSet:
+    """Values with how many times each of them is available to the parameters sharing the set.
+
+    The values and counts are extracted from `available` once and reused by every search, so `available`
+    must not be modified afterwards. Sets are compared and hashed by identity: parameters share their available
+    counts only when they use the same set.
+    """
     available: dict[Any, int]
 
-    def deepcopy(self) -> dict[Any, int]:
-        return copy.deepcopy(self.available)
+    @cached_property
+    def values(self) -> tuple[Any, ...]:
+        return tuple(self.available)
+
+    @cached_property
+    def counts(self) -> tuple[int, ...]:
+        return tuple(self.available.values())
+
+    @cached_property
+    def arrays(self) -> tuple[Any, Any]:
+        """Read-only float64 NumPy array of the values and int64 one of the counts. Requires NumPy."""
+        import numpy as np
 
-    def __hash__(self) -> int:
-        return id(self)
+        values = np.array(self.values, dtype=np.float64)
+        counts = np.array(self.counts, dtype=np.int64)
+        values.setflags(write=False)
+        counts.setflags(write=False)
+        return values, counts
 
 
 @dataclass
@@ -27,17 +46,9 @@ class CombinationResult:
     parameter_values: tuple[Any]
     score: float
 
-    def __lt__(self, other: "CombinationResult") -> bool:
-        return self.score.__lt__(other.score)
-
-    def __gt__(self, other: "CombinationResult") -> bool:
-        return self.score.__gt__(other.score)
-
     def to_str(self, parameter_names: tuple[str, ...], interpretation: Callable[..., str]) -> str:
-        params_to_values = (f"{name}={value}" for name, value in zip(parameter_names, self.parameter_values))
-        params_to_values_str = ", ".join(params_to_values)
-        input_str = f"({params_to_values_str})"
-        return f"{input_str} => (score={self.score}, {interpretation(*self.parameter_values)})"
+        params_to_values_str = ", ".join([f"{name}={value}" for name, value in zip(parameter_names, self.parameter_values)])
+        return f"({params_to_values_str}) => (score={self.score}, {interpretation(*self.parameter_values)})"
 
 
 @dataclass
@@ -48,16 +59,247 @@ class CombinationResults:
 
     def to_str(self, separator: str = '\n') -> str:
         parameter_names = tuple(param.name for param in self.parameters)
-        return separator.join(res.to_str(parameter_names, self.interpretation) for res in self.results)
+        return separator.join([res.to_str(parameter_names, self.interpretation) for res in self.results])
 
     def __repr__(self) -> str:
         return self.to_str("")
 
 
 @dataclass
-class ParameterAndRemainingValue:
-    parameter: Parameter
-    available: dict[Any, int]
+class FactoredScore:
+    """Score computed level by level while the parameter values are chosen.
+
+    `partials[parameter_index](previous_partial, value)` folds the value chosen for a parameter into the
+    partial result of the previous ones (`initial` for the first parameter), and `final` turns the partial
+    result of all parameters into the score. Work done in the partial function of a parameter is shared by
+    every combination of the parameters that come after it.
+    """
+    partials: tuple[Callable[[Any, Any], Any], ...]
+    final: Callable[[Any], float]
+    initial: Any = None
+
+
+def _kernel_source(counted: tuple[bool, ...], factored: bool, bounded: bool) -> str:
+    parameter_count = len(counted)
+    lines = ["def kernel(values, counts, score, partials, initial, upper_bound, top_results, capacity):"]
+    if parameter_count == 0:
+        lines.append("    return")
+        return "\n".join(lines)
+
+    # Combinations are appended until `capacity` of them are kept (a negative capacity keeps them all), then
+    # turned into a heap where only a score greater than the lowest one kept replaces it: on ties, the
+    # earliest combination stays.
+    lines += [
+        "    append = top_results.append",
+        "    filling = capacity != 0",
+        "    lowest = math.inf",
+        "    order = 0",
+    ]
+    lines.append(f"    {''.join(f'values_{index}, ' for index in range(parameter_count))}= values")
+    if any(counted):
+        lines.append(f"    {''.join(f'counts_{index}, ' for index in range(parameter_count))}= counts")
+    if factored:
+        lines.append(f"    {''.join(f'fold_{index}, ' for index in range(parameter_count))}= partials")
+    for index in range(parameter_count):
+        indent = "    " * (index + 1)
+        if not counted[index]:
+            lines.append(f"{indent}for value_{index} in values_{index}:")
+        # Nothing after the last parameter reads its remaining counts
+        elif index + 1 < parameter_count:
+            lines += [
+                f"{indent}for index_{index}, value_{index} in enumerate(values_{index}):",
+                f"{indent}    count_{index} = counts_{index}[index_{index}]",
+                f"{indent}    if count_{index} <= 0:",
+                f"{indent}        continue",
+            ]
+        else:
+            lines += [
+                f"{indent}for value_{index}, count_{index} in zip(values_{index}, counts_{index}):",
+                f"{indent}    if count_{index} <= 0:",
+                f"{indent}        continue",
+            ]
+        if bounded and index + 1 < parameter_count:
+            prefix = ", ".join(f"value_{previous_index}" for previous_index in range(index + 1))
+            lines += [
+                f"{indent}    if not filling and upper_bound(({prefix},), {index}) <= lowest:",
+                f"{indent}        continue",
+            ]
+        if counted[index] and index + 1 < parameter_count:
+            lines.append(f"{indent}    counts_{index}[index_{index}] = count_{index} - 1")
+        if factored:
+            previous_partial = f"partial_{index - 1}" if index else "initial"
+            lines.append(f"{indent}    partial_{index} = fold_{index}({previous_partial}, value_{index})")
+    values = ", ".join(f"value_{index}" for index in range(parameter_count))
+    score_arguments = f"partial_{parameter_count - 1}" if factored else values
+    indent = "    " * (parameter_count + 1)
+    lines += [
+        f"{indent}score_ = score({score_arguments})",
+        f"{indent}if filling:",
+        f"{indent}    order -= 1",
+        f"{indent}    append((score_, order, ({values},)))",
+        f"{indent}    if len(top_results) == capacity:",
+        f"{indent}        heapify(top_results)",
+        f"{indent}        filling = False",
+        f"{indent}        lowest = top_results[0][0]",
+        f"{indent}elif lowest < score_:",
+        f"{indent}    order -= 1",
+        f"{indent}    heapreplace(top_results, (score_, order, ({values},)))",
+        f"{indent}    lowest = top_results[0][0]",
+    ]
+    for index in reversed(range(parameter_count - 1)):
+        if counted[index]:
+            lines.append(f"{'    ' * (index + 2)}counts_{index}[index_{index}] = count_{index}")
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def _build_kernel(counted: tuple[bool, ...], factored: bool, bounded: bool) -> Callable[..., None]:
+    """Compiles nested loops enumerating the combinations of one parameter per item of `counted`.
+
+    For the parameters that are `counted`, the `counts` of their `values` are decremented while a value is
+    chosen, and parameters sharing a value set share their counts so that they cannot use a value more often
+    than it is available. The other parameters go through all of their `values`.
+    Scored combinations go straight into `top_results` as `(score, -order, values)` entries, without a
+    function call per combination. Once `capacity` combinations are kept, the combinations starting with
+    values for which `upper_bound` is not above the lowest kept score are skipped. Kernels only depend on
+    their arguments, so they are compiled once per parameter count and counted parameters.
+    """
+    namespace: dict[str, Any] = {"math": math, "heapify": heapq.heapify, "heapreplace": heapq.heapreplace}
+    exec(compile(_kernel_source(counted, factored, bounded), "<combination_ranker kernel>", "exec"), namespace)
+    return namespace["kernel"]
+
+
+def _jit_heap_sift_up(heap_scores: Any, heap_combinations: Any, position: int) -> None:
+    """Restores the min-heap after a combination was appended at `position`.
+
+    Combinations are identified by their mixed-radix number, the index of their value indices in the
+    Cartesian product of the value sets, which grows in enumeration order. Heap entries are ordered by score,
+    then by number reversed so that the latest combination is the first one evicted on ties, like the
+    `(score, -order)` tuples of `Finder.get_best`.
+    """
+    while 0 < position:
+        parent = (position - 1) // 2
+        if heap_scores[parent] < heap_scores[position] or (
+            heap_scores[parent] == heap_scores[position] and heap_combinations[parent] > heap_combinations[position]
+        ):
+            break
+        heap_scores[position], heap_scores[parent] = heap_scores[parent], heap_scores[position]
+        heap_combinations[position], heap_combinations[parent] = heap_combinations[parent], heap_combinations[position]
+        position = parent
+
+
+def _jit_heap_sift_down(heap_scores: Any, heap_combinations: Any, size: int) -> None:
+    """Restores the min-heap of `size` combinations after its root was replaced."""
+    position = 0
+    while True:
+        child = 2 * position + 1
+        if size <= child:
+            break
+        sibling = child + 1
+        if sibling < size and (
+            heap_scores[sibling] < heap_scores[child] or (
+                heap_scores[sibling] == heap_scores[child] and heap_combinations[sibling] > heap_combinations[child]
+            )
+        ):
+            child = sibling
+        if heap_scores[position] < heap_scores[child] or (
+            heap_scores[position] == heap_scores[child] and heap_combinations[position] > heap_combinations[child]
+        ):
+            break
+        heap_scores[position], heap_scores[child] = heap_scores[child], heap_scores[position]
+        heap_combinations[position], heap_combinations[child] = heap_combinations[child], heap_combinations[position]
+        position = child
+
+
+def _jit_kernel_source(value_set_indices: tuple[int, ...], parallel: bool) -> str:
+    parameter_count = len(value_set_indices)
+    arguments = "".join(f"values_{index}, " for index in range(parameter_count))
+    arguments += "".join(f"counts_{set_index}, " for set_index in sorted(set(value_set_indices)))
+    lines = [f"def kernel({arguments}score, capacity):"]
+    if parallel:
+        # Every value of the first parameter gets its own heap and copy of the counts
+        lines += [
+            "    rows = len(values_0)",
+            "    row_heap_scores = np.empty((rows, capacity), np.float64)",
+            "    row_heap_combinations = np.empty((rows, capacity), np.int64)",
+            "    sizes = np.zeros(rows, np.int64)",
+            "    for index_0 in prange(rows):",
+            "        heap_scores = row_heap_scores[index_0]",
+            "        heap_combinations = row_heap_combinations[index_0]",
+            "        size = 0",
+        ]
+        lines += [
+            f"        row_counts_{set_index} = counts_{set_index}.copy()" for set_index in sorted(set(value_set_indices))
+        ]
+        counts = "row_counts_{}"
+    else:
+        lines += [
+            "    heap_scores = np.empty(capacity, np.float64)",
+            "    heap_combinations = np.empty(capacity, np.int64)",
+            "    size = 0",
+        ]
+        counts = "counts_{}"
+    for index, set_index in enumerate(value_set_indices):
+        indent = "    " * (index + 2)
+        previous_combination = f"combination_{index - 1} * len(values_{index}) + " if index else ""
+        if index or not parallel:
+            lines.append(f"{'    ' * (index + 1)}for index_{index} in range(len(values_{index})):")
+        lines += [
+            f"{indent}count_{index} = {counts.format(set_index)}[index_{index}]",
+            f"{indent}if count_{index} <= 0:",
+            f"{indent}    continue",
+            f"{indent}combination_{index} = {previous_combination}index_{index}",
+        ]
+        if index + 1 < parameter_count:
+            lines.append(f"{indent}{counts.format(set_index)}[index_{index}] = count_{index} - 1")
+    indent = "    " * (parameter_count + 1)
+    values = ", ".join(f"values_{index}[index_{index}]" for index in range(parameter_count))
+    lines += [
+        f"{indent}value = score({values})",
+        f"{indent}if size < capacity:",
+        f"{indent}    heap_scores[size] = value",
+        f"{indent}    heap_combinations[size] = combination_{parameter_count - 1}",
+        f"{indent}    _jit_heap_sift_up(heap_scores, heap_combinations, size)",
+        f"{indent}    size += 1",
+        f"{indent}elif 0 < capacity and heap_scores[0] < value:",
+        f"{indent}    heap_scores[0] = value",
+        f"{indent}    heap_combinations[0] = combination_{parameter_count - 1}",
+        f"{indent}    _jit_heap_sift_down(heap_scores, heap_combinations, size)",
+    ]
+    for index in reversed(range(1 if parallel else 0, parameter_count - 1)):
+        set_index = value_set_indices[index]
+        lines.append(f"{'    ' * (index + 2)}{counts.format(set_index)}[index_{index}] = count_{index}")
+    if parallel:
+        lines += [
+            "        sizes[index_0] = size",
+            "    kept = np.arange(capacity) < sizes.reshape((rows, 1))",
+            "    return row_heap_scores.ravel()[kept.ravel()], row_heap_combinations.ravel()[kept.ravel()]",
+        ]
+    else:
+        lines.append("    return heap_scores[:size], heap_combinations[:size]")
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def _build_jit_kernel(value_set_indices: tuple[int, ...], parallel: bool) -> Callable[..., tuple[Any, Any]]:
+    """Compiles `_jit_kernel_source` and the heap helpers it calls with Numba.
+
+    `value_set_indices` numbers the value set of each parameter, so that parameters sharing a set share
+    its counts. When `parallel`, the values of the first parameter are spread over threads, each keeping the
+    best combinations starting with its values. Kernels are kept for the lifetime of the process because
+    Numba cannot cache functions compiled from generated source on disk.
+    """
+    import numba
+    import numpy as np
+
+    namespace: dict[str, Any] = {
+        "np": np,
+        "prange": numba.prange,
+        "_jit_heap_sift_up": numba.njit(_jit_heap_sift_up),
+        "_jit_heap_sift_down": numba.njit(_jit_heap_sift_down),
+    }
+    exec(compile(_jit_kernel_source(value_set_indices, parallel), "<combination_ranker jit kernel>", "exec"), namespace)
+    return numba.njit(namespace["kernel"], parallel=parallel)
 
 
 @dataclass
@@ -65,6 +307,10 @@ class Finder:
     parameters_to_set: tuple[tuple[Parameter, ParameterValueSet], ...]
     score: Callable[..., float]
     interpretation: Callable[..., str]
+    factored_score: FactoredScore | None = None
+    # upper_bound(parameter_values, parameter_index) returns a score that no combination starting with the
+    # `parameter_index + 1` given values can exceed, letting get_best skip them once better ones are known
+    upper_bound: Callable[[tuple[Any, ...], int], float] | None = None
 
     def estimate_iteration_count(self) -> int:
         if not any(self.parameters_to_set):
@@ -77,44 +323,192 @@ class Finder:
         )
 
     def get_best(self, count: int) -> CombinationResults:
+        # Min-heap of the best combinations so far, bounded by `count` when it is not negative
+        top_results: list[tuple[float, int, tuple[Any, ...]]] = []
+        capacity = count
+        # Keeping a heap only pays off when few of the combinations are kept, otherwise sorting them all is faster
+        if 0 <= count and self.estimate_iteration_count() <= count * 100:
+            capacity = -1
 
-        def copy_sets() -> list[ParameterAndRemainingValue]:
-            copied_parameters_to_set: list[ParameterAndRemainingValue] = []
-            set_of_sets: set[ParameterValueSet] = { value_set for _param, value_set in self.parameters_to_set }
-            sets_to_copies: dict[ParameterValueSet, dict[Any, int]] = {
-                value_set: value_set.deepcopy() for value_set in set_of_sets
-            }
-            for param, value_set in self.parameters_to_set:
-                copied_parameters_to_set.append(
-                    ParameterAndRemainingValue(param, sets_to_copies[value_set])
-                )
-            return copied_parameters_to_set
-
-        copied_parameters_to_set: list[ParameterAndRemainingValue] = copy_sets()
-
-        def add_combinations(combination_results: list[CombinationResult], previous_parameter_values: list[Any | None], parameter_index: int) -> None:
-            available_values = copied_parameters_to_set[parameter_index].available
-            for value, instance_count in available_values.items():
-                if instance_count <= 0:
-                    continue
-                available_values[value] -= 1
-                try:
-                    previous_parameter_values[parameter_index] = value
-                    if parameter_index + 1 < len(previous_parameter_values):
-                        add_combinations(combination_results, previous_parameter_values, parameter_index + 1)
-                    else:
-                        parameters = previous_parameter_values
-                        combination_results.append(CombinationResult(tuple(parameters), self.score(*parameters)))
-                finally:
-                    available_values[value] += 1
-
-        combination_results: list[CombinationResult] = []
-        parameter_values = [None for _ in self.parameters_to_set]
-        add_combinations(combination_results, parameter_values, 0)
-        combination_count = len(combination_results)
-        result_count = min(count, combination_count) if 0 <= count else combination_count
+        sharing_counts: dict[ParameterValueSet, int] = {}
+        for _param, value_set in self.parameters_to_set:
+            sharing_counts[value_set] = sharing_counts.get(value_set, 0) + 1
+        # Counts only restrict the combinations of a set's parameters when a value is available fewer times than
+        # they share it, otherwise its values that are available at all can be enumerated without tracking them
+        sets_to_counts: dict[ParameterValueSet, list[int] | None] = {
+            value_set: list(value_set.counts)
+            if any(0 < instance_count < sharing_count for instance_count in value_set.counts) else None
+            for value_set, sharing_count in sharing_counts.items()
+        }
+        values = tuple(
+            value_set.values if sets_to_counts[value_set] is not None
+            else tuple(value for value, instance_count in zip(value_set.values, value_set.counts) if 0 < instance_count)
+            for _param, value_set in self.parameters_to_set
+        )
+        counts = tuple(sets_to_counts[value_set] or () for _param, value_set in self.parameters_to_set)
+        kernel = _build_kernel(
+            tuple(sets_to_counts[value_set] is not None for _param, value_set in self.parameters_to_set),
+            self.factored_score is not None, self.upper_bound is not None
+        )
+        if self.factored_score is None:
+            kernel(values, counts, self.score, (), None, self.upper_bound, top_results, capacity)
+        else:
+            kernel(
+                values, counts, self.factored_score.final, self.factored_score.partials, self.factored_score.initial,
+                self.upper_bound, top_results, capacity
+            )
+        top_results.sort(reverse=True)
+        if 0 <= count:
+            del top_results[count:]
         return CombinationResults(
-            heapq.nlargest(result_count, combination_results),
+            [CombinationResult(values, score) for score, _order, values in top_results],
             tuple(param for param, _value_set in self.parameters_to_set),
             self.interpretation
         )
+
+    def get_best_vectorized(
+        self, count: int, score_ufunc: Callable[..., Any], dtype: Any = None
+    ) -> CombinationResults:
+        """Same ranking as `get_best`, scoring all combinations at once with NumPy.
+
+        `score_ufunc` is called once with one broadcastable array per parameter and must compute the scores
+        elementwise. Every combination is scored before the values are checked against their available counts,
+        so this trades memory proportional to `estimate_iteration_count()` for speed. Requires NumPy.
+
+        The arrays are float64 unless another `dtype` is given: `np.float32` halves the memory and is faster, at
+        the cost of scores rounded to about 7 significant digits, so combinations whose scores only differ
+        beyond that may be ranked as ties.
+        """
+        import numpy as np
+
+        parameters = tuple(param for param, _value_set in self.parameters_to_set)
+        if not self.parameters_to_set:
+            return CombinationResults([], parameters, self.interpretation)
+
+        value_lists: list[list[Any]] = []
+        value_arrays: list[Any] = []
+        counts_of_sets: dict[ParameterValueSet, Any] = {}
+        parameter_indices_of_sets: dict[ParameterValueSet, list[int]] = {}
+        for parameter_index, (_param, value_set) in enumerate(self.parameters_to_set):
+            values, counts = value_set.arrays
+            available = 0 < counts
+            value_lists.append(
+                [value for value, instance_count in zip(value_set.values, value_set.counts) if 0 < instance_count]
+            )
+            value_arrays.append(values[available] if dtype is None else values[available].astype(dtype))
+            counts_of_sets[value_set] = counts[available]
+            parameter_indices_of_sets.setdefault(value_set, []).append(parameter_index)
+
+        shape = tuple(len(values) for values in value_lists)
+        grids = np.meshgrid(*value_arrays, indexing='ij', sparse=True)
+        scores = np.broadcast_to(score_ufunc(*grids), shape).ravel()
+
+        # Parameters sharing a value set must not use a value more often than it is available
+        valid = None
+        index_grids = np.meshgrid(*(np.arange(size) for size in shape), indexing='ij', sparse=True)
+        for value_set, parameter_indices in parameter_indices_of_sets.items():
+            counts = counts_of_sets[value_set]
+            if len(parameter_indices) <= counts.min(initial=len(parameter_indices)):
+                continue
+            if valid is None:
+                valid = np.ones(shape, dtype=bool)
+            for parameter_index in parameter_indices:
+                occurrences = sum(
+                    index_grids[other_index] == index_grids[parameter_index] for other_index in parameter_indices
+                )
+                valid &= occurrences <= counts[index_grids[parameter_index]]
+
+        # Scores are negated to select the lowest ones: scores of 0 are common once exponentials underflow, and
+        # partitioning near the end of many equal values is much slower. Invalid combinations and NaN rank last.
+        if valid is None:
+            negated_scores = np.negative(scores)
+            valid_count = negated_scores.size
+        else:
+            valid = valid.ravel()
+            negated_scores = np.where(valid, np.negative(scores), np.inf)
+            valid_count = np.count_nonzero(valid)
+        np.fmin(negated_scores, np.inf, out=negated_scores)
+        if 0 <= count < valid_count:
+            if count == 0:
+                selected = np.zeros(negated_scores.size, dtype=bool)
+            else:
+                threshold = negated_scores[np.argpartition(negated_scores, count - 1)[count - 1]]
+                selected = negated_scores <= threshold
+            if valid is not None:
+                selected &= valid
+            candidates = np.flatnonzero(selected)
+        else:
+            candidates = np.arange(negated_scores.size) if valid is None else np.flatnonzero(valid)
+        # Best first, and the earliest enumerated combination first on ties like `get_best`
+        candidates = candidates[np.lexsort((candidates, negated_scores[candidates]))]
+        if 0 <= count:
+            candidates = candidates[:count]
+
+        value_indices = np.unravel_index(candidates, shape)
+        return CombinationResults(
+            [
+                CombinationResult(
+                    tuple(values[index] for values, index in zip(value_lists, indices)),
+                    float(scores[candidate])
+                )
+                for candidate, indices in zip(candidates, zip(*(indices.tolist() for indices in value_indices)))
+            ],
+            parameters,
+            self.interpretation
+        )
+
+    def get_best_jit(self, count: int, score_jit: Callable[..., float], parallel: bool = False) -> CombinationResults:
+        """Same ranking as `get_best`, enumerating and scoring in machine code compiled by Numba.
+
+        `score_jit` must be a Numba-compiled function taking one float64 per parameter. The kernel keeps
+        its own bounded heap, so memory stays proportional to `count`. With `parallel`, the values of the
+        first parameter are shared among threads, each with its own heap, and memory grows with the number of
+        those values. Requires Numba.
+        """
+        import numpy as np
+
+        parameters = tuple(param for param, _value_set in self.parameters_to_set)
+        if not self.parameters_to_set:
+            return CombinationResults([], parameters, self.interpretation)
+
+        set_indices: dict[ParameterValueSet, int] = {}
+        for _param, value_set in self.parameters_to_set:
+            set_indices.setdefault(value_set, len(set_indices))
+        value_set_indices = tuple(set_indices[value_set] for _param, value_set in self.parameters_to_set)
+        # The parallel kernel copies the counts for every thread instead of modifying them
+        arrays = [value_set.arrays[0] for _param, value_set in self.parameters_to_set] + [
+            value_set.arrays[1] if parallel else value_set.arrays[1].copy() for value_set in set_indices
+        ]
+
+        if parallel:
+            # No more combinations than those of the parameters after the first one start with one value
+            capacity = self.estimate_iteration_count() // len(arrays[0]) if len(arrays[0]) else 0
+            if 0 <= count:
+                capacity = min(count, capacity)
+        else:
+            capacity = count if 0 <= count else self.estimate_iteration_count()
+        kernel = _build_jit_kernel(value_set_indices, parallel)
+        heap_scores, heap_combinations = kernel(*arrays, score_jit, capacity)
+
+        ranking = np.lexsort((heap_combinations, -heap_scores))
+        if 0 <= count:
+            ranking = ranking[:count]
+        value_indices = np.unravel_index(
+            heap_combinations[ranking], tuple(len(value_set.values) for _param, value_set in self.parameters_to_set)
+        )
+        return CombinationResults(
+            [
+                CombinationResult(
+                    tuple(
+                        value_set.values[index]
+                        for (_param, value_set), index in zip(self.parameters_to_set, indices)
+                    ),
+                    score
+                )
+                for score, indices in zip(
+                    heap_scores[ranking].tolist(), zip(*(indices.tolist() for indices in value_indices))
+                )
+            ],
+            parameters,
+            self.interpretation
+        )
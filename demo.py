@@ -1,4 +1,4 @@
-from combination_ranker import Parameter, ParameterValueSet, Finder
+from combination_ranker import Parameter, ParameterValueSet, Finder, FactoredScore
 
 
 def main() -> None:
@@ -10,6 +10,10 @@ def main() -> None:
     def proximity_exp(value: float, target: float) -> float:
         return math.exp(-(value - target) ** 2)
 
+    def proximity_exp_both(value_1: float, target_1: float, value_2: float, target_2: float) -> float:
+        # proximity_exp(value_1, target_1) * proximity_exp(value_2, target_2) with a single exponential
+        return math.exp(-(value_1 - target_1) ** 2 - (value_2 - target_2) ** 2)
+
     def coef_a(r1: float, r2: float, c1: float, c2: float) -> float:
         return (r1 * c1) / (r2 * c2)
 
@@ -17,7 +21,30 @@ def main() -> None:
         return r2 * c2
 
     def score(r1: float, r2: float, c1: float, c2: float) -> float:
-        return proximity_exp(coef_t(r2, c2), 0.76) * proximity_exp(coef_a(r1, r2, c1, c2), 10)
+        return proximity_exp_both(coef_t(r2, c2), 0.76, coef_a(r1, r2, c1, c2), 10)
+
+    def partial_r1(_previous: None, r1: float) -> float:
+        return r1
+
+    def partial_r2(r1: float, r2: float) -> tuple[float, dict[float, tuple[float, float]]]:
+        return r1, r2_c2_table[r2]
+
+    def partial_c1(
+        previous: tuple[float, dict[float, tuple[float, float]]], c1: float
+    ) -> tuple[float, dict[float, tuple[float, float]]]:
+        r1, r2_row = previous
+        return r1 * c1, r2_row
+
+    def partial_c2(
+        previous: tuple[float, dict[float, tuple[float, float]]], c2: float
+    ) -> tuple[float, tuple[float, float]]:
+        r1_c1, r2_row = previous
+        return r1_c1, r2_row[c2]
+
+    def final_score(partial: tuple[float, tuple[float, float]]) -> float:
+        r1_c1, (r2_c2, r2_c2_proximity) = partial
+        # proximity_exp(r1_c1 / r2_c2, 10) inlined, since this runs for every combination
+        return r2_c2_proximity * math.exp(-(r1_c1 / r2_c2 - 10) ** 2)
 
     def interpretation(r1: float, r2: float, c1: float, c2: float) -> str:
         return f"T={coef_t(r2, c2)}, a={coef_a(r1, r2, c1, c2)}"
@@ -66,6 +93,34 @@ def main() -> None:
         # 82e-12: cn, 820e-12: cn, 8200e-12: cn, .082e-3: cn, .82e-3: cn, 8.2e-3: cn,
     })
 
+    # r2 and c2 only take values from r_set and c_set, so T and its proximity are computed once per pair of values
+    r2_c2_table = {
+        r2: {c2: (r2 * c2, proximity_exp(r2 * c2, 0.76)) for c2 in c_set.available}
+        for r2 in r_set.available
+    }
+
+    def distance(low: float, high: float, target: float) -> float:
+        if target < low:
+            return low - target
+        if high < target:
+            return target - high
+        return 0.0
+
+    c_min, c_max = min(c_set.available), max(c_set.available)
+
+    def upper_bound(parameter_values: tuple[float, ...], parameter_index: int) -> float:
+        if parameter_index == 0:
+            return 1.0
+        r1, r2 = parameter_values[:2]
+        if parameter_index == 1:
+            r1_c1_min, r1_c1_max = r1 * c_min, r1 * c_max
+        else:
+            r1_c1_min = r1_c1_max = r1 * parameter_values[2]
+        r2_c2_min, r2_c2_max = r2 * c_min, r2 * c_max
+        return math.exp(
+            -distance(r2_c2_min, r2_c2_max, 0.76) ** 2 - distance(r1_c1_min / r2_c2_max, r1_c1_max / r2_c2_min, 10) ** 2
+        )
+
     finder = Finder(
         (
             (Parameter("r1"), r_set),
@@ -74,7 +129,9 @@ def main() -> None:
             (Parameter("c2"), c_set),
         ),
         score,
-        interpretation
+        interpretation,
+        FactoredScore((partial_r1, partial_r2, partial_c1, partial_c2), final_score),
+        upper_bound
     )
 
     estimate_iter_count = finder.estimate_iteration_count()
@@ -84,6 +141,37 @@ def main() -> None:
     print(best_results.to_str())
     print(f"-> {time.time() - start_time} seconds")
 
+    try:
+        import numpy as np
+    except ImportError:
+        return
+
+    def score_ufunc(r1: np.ndarray, r2: np.ndarray, c1: np.ndarray, c2: np.ndarray) -> np.ndarray:
+        t = r2 * c2
+        return np.exp(-(t - 0.76) ** 2 - ((r1 * c1) / t - 10) ** 2)
+
+    start_time = time.time()
+    best_results = finder.get_best_vectorized(10, score_ufunc)
+    print(best_results.to_str())
+    print(f"-> {time.time() - start_time} seconds (NumPy)")
+
+    try:
+        import numba
+    except ImportError:
+        return
+
+    proximity_exp_both_jit = numba.njit(proximity_exp_both)
+
+    @numba.njit
+    def score_jit(r1: float, r2: float, c1: float, c2: float) -> float:
+        t = r2 * c2
+        return proximity_exp_both_jit(t, 0.76, (r1 * c1) / t, 10)
+
+    start_time = time.time()
+    best_results = finder.get_best_jit(10, score_jit, parallel=True)
+    print(best_results.to_str())
+    print(f"-> {time.time() - start_time} seconds (Numba, including compilation)")
+
 
 if __name__ == "__main__":
     main()